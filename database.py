@@ -5,11 +5,12 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import Sequence, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -21,12 +22,39 @@ db = None
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
+# Pool limits apply per process, so the connection budget (MONGO_MAX_CONNECTIONS)
+# is split across the Gunicorn workers (WEB_CONCURRENCY, set by gunicorn.conf.py)
+_workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+_max_pool_size = max(5, int(os.getenv("MONGO_MAX_CONNECTIONS", "100")) // _workers)
+
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # One pooled client per process, shared by all handlers
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=_max_pool_size,
+        minPoolSize=2,
+        maxIdleTimeMS=60000,  # recycle idle sockets before middleboxes drop them
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=3000,
+        compressors="zstd,zlib",
+        retryReads=True,
+        retryWrites=True,
+    )
     db = _client[database_name]
 
+# Collection handles built once instead of on every db[name] lookup
+COLLECTION_NAMES = (
+    "designer", "goal", "skillassessment", "review", "guild",
+    "mentorship", "trainingresource", "project", "notification",
+)
+COLLECTIONS = {name: db[name] for name in COLLECTION_NAMES} if db is not None else {}
+
+def _collection(collection_name: str):
+    collection = COLLECTIONS.get(collection_name)
+    return collection if collection is not None else db[collection_name]
+
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -40,16 +68,85 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await _collection(collection_name).insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+async def create_documents(collection_name: str, items: Sequence[Union[BaseModel, dict]]):
+    """Insert several documents with timestamps in one unordered batch, return (ids, errors)"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    now = datetime.now(timezone.utc)
+    docs = []
+    for data in items:
+        data_dict = data.model_dump() if isinstance(data, BaseModel) else data.copy()
+        data_dict['created_at'] = now
+        data_dict['updated_at'] = now
+        docs.append(data_dict)
+
+    # ordered=False lets the server keep going past individual failures
+    try:
+        result = await _collection(collection_name).insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        # Partial failure: the other documents were stored, so report both sides
+        write_errors = e.details.get("writeErrors", [])
+        failed = {err["index"] for err in write_errors}
+        # insert_many assigns _id to each document before sending it
+        ids = [str(doc["_id"]) for i, doc in enumerate(docs) if i not in failed]
+        errors = [{"index": err["index"], "message": err.get("errmsg", "")} for err in write_errors]
+        return ids, errors
+    return [str(_id) for _id in result.inserted_ids], []
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = _collection(collection_name).find(filter_dict or {})
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=limit)
+
+def _agg_pipeline(match: dict = None, limit: int = None, projection: dict = None):
+    pipeline = [{"$match": match or {}}]
+    if limit:
+        pipeline.append({"$limit": limit})
+    pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
+    if projection:
+        pipeline.append({"$project": projection})
+    return pipeline
+
+async def get_documents_agg(collection_name: str, match: dict = None, limit: int = None, projection: dict = None):
+    """Get documents via an aggregation pipeline with _id already converted to a string server-side"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return await _collection(collection_name).aggregate(_agg_pipeline(match, limit, projection)).to_list(length=None)
+
+def stream_documents_agg(collection_name: str, match: dict = None, limit: int = None, projection: dict = None):
+    """Same as get_documents_agg, but return the cursor for `async for` instead of a list"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return _collection(collection_name).aggregate(_agg_pipeline(match, limit, projection))
+
+# Indexes backing the filters used by the list endpoints: (collection, keys)
+INDEXES = [
+    ("goal", "designer_id"),
+    ("skillassessment", [("designer_id", 1), ("cycle", 1)]),
+    ("review", [("designer_id", 1), ("cycle", 1)]),
+    ("mentorship", "mentor_id"),
+    ("mentorship", "mentee_id"),
+    ("project", "manager_id"),
+    ("project", "designers"),  # multikey, serves $in
+    ("trainingresource", "tags"),  # multikey, serves $in
+    ("notification", "user_id"),
+]
+
+async def ensure_indexes():
+    """Create the indexes in INDEXES (idempotent, safe to run on every startup)"""
+    if db is None:
+        return
+    for collection_name, keys in INDEXES:
+        await _collection(collection_name).create_index(keys)
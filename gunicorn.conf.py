@@ -0,0 +1,21 @@
+"""
+Gunicorn configuration
+
+Runs the FastAPI app on several Uvicorn worker processes:
+
+    gunicorn -c gunicorn.conf.py main:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 8000)}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Async workers each multiplex many requests, so one per core is enough
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Let database.py size each worker's Mongo pool from the actual worker count
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+# Import the app once in the master and fork workers from it. Safe with Motor,
+# which does not open any connections until the first query in each worker.
+preload_app = True
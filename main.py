@@ -1,29 +1,203 @@
+import asyncio
+import logging
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-
-from database import db, create_document, get_documents
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Type
+
+import orjson
+from cachetools import TTLCache  # type: ignore[import-untyped]
+from fastapi import APIRouter, Body, FastAPI, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ConfigDict
+from starlette.datastructures import MutableHeaders
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+import schemas
+from database import (
+    db, create_document, create_documents, get_documents_agg, stream_documents_agg, ensure_indexes,
+)
 
-app = FastAPI(title="Designer Growth Platform API")
+logger = logging.getLogger(__name__)
+
+def dumps(content: Any) -> bytes:
+    """Serialize exactly like the endpoints returning dicts/lists (jsonable_encoder, then orjson)"""
+    return orjson.dumps(jsonable_encoder(content))
+
+async def _ndjson(cursor):
+    async for doc in cursor:
+        yield dumps(doc) + b"\n"
+
+def ndjson_response(cursor) -> StreamingResponse:
+    """Stream a Mongo cursor as newline-delimited JSON, one document per line"""
+    return StreamingResponse(_ndjson(cursor), media_type="application/x-ndjson")
+
+class ServerErrorRoute(APIRoute):
+    """Route that turns any unexpected exception from an endpoint into a 500 {"detail": ...}
+    response, so handlers need no try/except of their own"""
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                return await handler(request)
+            # Starlette's base class, so HTTPExceptions raised by Starlette itself pass through too
+            except (StarletteHTTPException, RequestValidationError):
+                raise
+            except Exception as e:
+                logger.exception("Unhandled error in %s %s", request.method, request.url.path)
+                return ORJSONResponse({"detail": str(e)}, status_code=500)
+
+        return route_handler
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # An unreachable database must not keep the API from starting; /test reports it
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logger.warning("Could not ensure indexes: %s", e)
+    yield
+
+app = FastAPI(title="Designer Growth Platform API", default_response_class=ORJSONResponse,
+              lifespan=lifespan)
+app.router.route_class = ServerErrorRoute
+
+# CORS policy is fixed (any origin, method and header, with credentials), so the
+# response headers are precomputed instead of evaluated per request
+_CORS_SIMPLE_HEADERS = {
+    "access-control-allow-origin": "*",
+    "access-control-allow-credentials": "true",
+}
+_CORS_PREFLIGHT_HEADERS = [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"access-control-max-age", b"600"),
+    (b"vary", b"Origin"),
+    (b"content-length", b"0"),
+]
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+class StaticCORSMiddleware:
+    """ASGI CORS middleware equivalent to CORSMiddleware(allow_origins=["*"], allow_credentials=True,
+    allow_methods=["*"], allow_headers=["*"])"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = requested_method = requested_headers = None
+        has_cookie = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"cookie":
+                has_cookie = True
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and requested_method is not None:
+            headers = [(b"access-control-allow-origin", origin)] + _CORS_PREFLIGHT_HEADERS
+            if requested_headers:
+                headers.append((b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                # Merge like CORSMiddleware: replace any CORS headers the endpoint set
+                # and extend an existing Vary instead of adding a second one
+                headers = MutableHeaders(scope=message)
+                headers.update(_CORS_SIMPLE_HEADERS)
+                # "*" is not honoured by browsers for credentialed requests, so echo the origin then
+                if has_cookie:
+                    headers["access-control-allow-origin"] = origin.decode("latin-1")
+                    vary = headers.get("vary")
+                    if vary is None:
+                        headers["vary"] = "Origin"
+                    elif "origin" not in {v.strip().lower() for v in vary.split(",")}:
+                        headers["vary"] = f"{vary}, Origin"
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+app.add_middleware(StaticCORSMiddleware)
+
+@lru_cache(maxsize=128)
+def _parse_fields(fields: str) -> Dict[str, int]:
+    """Turn a ?fields=a,b,c query value into a Mongo projection (memoized per string)"""
+    names = dict.fromkeys(f for f in (p.strip() for p in fields.split(",")) if f)
+    for name in names:
+        parts = name.split(".")
+        if any(not part or part.startswith("$") for part in parts):
+            raise HTTPException(status_code=422, detail=f"Invalid field name: {name!r}")
+        for i in range(1, len(parts)):
+            if ".".join(parts[:i]) in names:
+                raise HTTPException(status_code=422, detail=f"Overlapping fields: {name!r}")
+    return dict.fromkeys(names, 1)
+
+def _projection(fields: Optional[str], default: Dict[str, int]) -> Dict[str, int]:
+    # _id is always returned by Mongo unless excluded, already stringified by the pipeline
+    return (_parse_fields(fields) if fields else None) or default
+
+def schema_projection(model: Type[BaseModel]) -> Dict[str, int]:
+    """Default list projection: every field of the collection's schema plus the timestamps"""
+    return {**{name: 1 for name in model.model_fields}, "created_at": 1, "updated_at": 1}
+
+# Short-lived cache of serialized list responses for slow-changing collections.
+# Keys carry a per-collection version that writes bump, so a create is visible
+# immediately in this process (other workers see it within the TTL).
+_list_cache: TTLCache = TTLCache(maxsize=64, ttl=60)
+_list_cache_versions: Dict[str, int] = {"guild": 0, "trainingresource": 0}
+
+async def cached_list(collection_name: str, match: Dict[str, Any], limit: int, projection: Dict[str, int]) -> Response:
+    key = (collection_name, _list_cache_versions[collection_name], limit,
+           orjson.dumps([match, projection], option=orjson.OPT_SORT_KEYS))
+    body = _list_cache.get(key)
+    if body is None:
+        # dumps() matches the uncached list endpoints' output byte for byte
+        body = dumps(await get_documents_agg(collection_name, match, limit, projection))
+        _list_cache[key] = body
+    return Response(body, media_type="application/json")
+
+def invalidate_list_cache(collection_name: str) -> None:
+    _list_cache_versions[collection_name] += 1
+
+# Upper bound on the number of items accepted by a /bulk endpoint
+MAX_BULK_ITEMS = 500
+
+async def bulk_insert(collection_name: str, docs: List[Dict[str, Any]]) -> Response:
+    ids, errors = await create_documents(collection_name, docs) if docs else ([], [])
+    # 207 when only some items were stored: ids lists those, errors the failed input indexes
+    return ORJSONResponse({"ids": ids, "errors": errors}, status_code=207 if errors else 200)
+
+class CreateModel(BaseModel):
+    """Base for request payloads: unknown keys are dropped, no assignment validation"""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=False, validate_assignment=False)
+
+def as_document(payload: CreateModel) -> Dict[str, Any]:
+    # Create* models only hold plain values/dicts/lists, so a shallow copy of the
+    # validated fields is equivalent to model_dump() without re-walking them
+    return dict(payload.__dict__)
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "Designer Growth Platform API running"}
 
-@app.get("/test")
-def test_database():
+@app.get("/test", include_in_schema=False)
+async def test_database():
     info = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -32,7 +206,7 @@ def test_database():
     try:
         if db is not None:
             info["database"] = "✅ Connected"
-            info["collections"] = db.list_collection_names()
+            info["collections"] = await db.list_collection_names()
         else:
             info["database"] = "❌ Not Connected"
     except Exception as e:
@@ -79,106 +253,111 @@ CAREER_LEVELS = [
     }},
 ]
 
+COMPETENCY_KEYS = frozenset(c["key"] for c in COMPETENCIES)
+
+# Static reference data is serialized once at import and served as-is
+REFERENCE: Dict[str, Any] = {"competencies": COMPETENCIES, "career_levels": CAREER_LEVELS}
+REFERENCE_JSON = orjson.dumps(REFERENCE)
+
 @app.get("/api/reference")
-def get_reference():
-    return {"competencies": COMPETENCIES, "career_levels": CAREER_LEVELS}
+async def get_reference():
+    return Response(REFERENCE_JSON, media_type="application/json")
 
 # -------- Designers --------
-class CreateDesigner(BaseModel):
+designers_router = APIRouter(tags=["designers"], route_class=ServerErrorRoute)
+PROJECTION_DESIGNER = schema_projection(schemas.Designer)
+
+class CreateDesigner(CreateModel):
     name: str
     email: str
     manager_id: Optional[str] = None
     current_level: str = "Junior"
 
-@app.post("/api/designers")
-def create_designer(payload: CreateDesigner):
-    try:
-        _id = create_document("designer", payload.model_dump())
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@designers_router.post("")
+async def create_designer(payload: CreateDesigner):
+    _id = await create_document("designer", as_document(payload))
+    return {"id": _id}
 
-@app.get("/api/designers")
-def list_designers():
-    try:
-        items = get_documents("designer", {}, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@designers_router.get("")
+async def list_designers(fields: Optional[str] = None):
+    return await get_documents_agg("designer", {}, 200, _projection(fields, PROJECTION_DESIGNER))
 
 # -------- Goals --------
-class CreateGoal(BaseModel):
+goals_router = APIRouter(tags=["goals"], route_class=ServerErrorRoute)
+PROJECTION_GOAL = schema_projection(schemas.Goal)
+
+class CreateGoal(CreateModel):
     designer_id: str
     title: str
     description: Optional[str] = None
     competency_key: Optional[str] = None
-    target_date: Optional[str] = None  # ISO date
-
-@app.post("/api/goals")
-def create_goal(payload: CreateGoal):
-    data = payload.model_dump()
-    if data.get("target_date"):
-        try:
-            data["target_date"] = datetime.fromisoformat(data["target_date"])  # store as datetime
-        except Exception:
-            pass
+    target_date: Optional[datetime] = None  # ISO date/datetime, parsed by pydantic
+
+@goals_router.post("")
+async def create_goal(payload: CreateGoal):
+    data = as_document(payload)
     data.setdefault("status", "not_started")
     data.setdefault("progress", 0)
-    try:
-        _id = create_document("goal", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    _id = await create_document("goal", data)
+    return {"id": _id}
 
-@app.get("/api/goals")
-def list_goals(designer_id: Optional[str] = None):
+@goals_router.get("")
+async def list_goals(designer_id: Optional[str] = None, fields: Optional[str] = None):
     query: Dict[str, Any] = {}
     if designer_id:
         query["designer_id"] = designer_id
-    try:
-        items = get_documents("goal", query, 500)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await get_documents_agg("goal", query, 500, _projection(fields, PROJECTION_GOAL))
+
+@goals_router.get("/stream")
+async def stream_goals(designer_id: Optional[str] = None, fields: Optional[str] = None):
+    query: Dict[str, Any] = {}
+    if designer_id:
+        query["designer_id"] = designer_id
+    return ndjson_response(stream_documents_agg("goal", query, 500, _projection(fields, PROJECTION_GOAL)))
 
 # -------- Skill Assessments --------
-class CreateAssessment(BaseModel):
+assessments_router = APIRouter(tags=["assessments"], route_class=ServerErrorRoute)
+PROJECTION_ASSESSMENT = schema_projection(schemas.SkillAssessment)
+
+class CreateAssessment(CreateModel):
     designer_id: str
     cycle: str  # e.g., 2025-H1
     ratings: Dict[str, int]
     notes: Optional[str] = None
 
-@app.post("/api/assessments")
-def create_assessment(payload: CreateAssessment):
-    data = payload.model_dump()
-    for k, v in list(data.get("ratings", {}).items()):
-        try:
-            iv = int(v)
-        except Exception:
-            iv = 1
-        data["ratings"][k] = max(1, min(4, iv))
+def _clamp_rating(v: Any) -> int:
     try:
-        _id = create_document("skillassessment", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@app.get("/api/assessments")
-def list_assessments(designer_id: str):
-    try:
-        items = get_documents("skillassessment", {"designer_id": designer_id}, 100)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        iv = int(v)
+    except (TypeError, ValueError):
+        return 1
+    return 1 if iv < 1 else 4 if iv > 4 else iv
+
+def _assessment_document(payload: CreateAssessment) -> Dict[str, Any]:
+    data = as_document(payload)
+    # Ratings for unknown competencies are dropped
+    data["ratings"] = {k: _clamp_rating(v) for k, v in data["ratings"].items() if k in COMPETENCY_KEYS}
+    return data
+
+@assessments_router.post("")
+async def create_assessment(payload: CreateAssessment):
+    data = _assessment_document(payload)
+    _id = await create_document("skillassessment", data)
+    return {"id": _id}
+
+@assessments_router.post("/bulk")
+async def create_assessments(payload: List[CreateAssessment] = Body(..., max_length=MAX_BULK_ITEMS)):
+    return await bulk_insert("skillassessment", [_assessment_document(p) for p in payload])
+
+@assessments_router.get("")
+async def list_assessments(designer_id: str, fields: Optional[str] = None):
+    return await get_documents_agg("skillassessment", {"designer_id": designer_id}, 100,
+                                   _projection(fields, PROJECTION_ASSESSMENT))
 
 # -------- Performance Reviews --------
-class CreateReview(BaseModel):
+reviews_router = APIRouter(tags=["reviews"], route_class=ServerErrorRoute)
+PROJECTION_REVIEW = schema_projection(schemas.Review)
+
+class CreateReview(CreateModel):
     designer_id: str
     cycle: str
     self_eval: Optional[Dict[str, int]] = None
@@ -186,195 +365,184 @@ class CreateReview(BaseModel):
     manager_eval: Optional[Dict[str, int]] = None
     summary: Optional[str] = None
 
-@app.post("/api/reviews")
-def create_review(payload: CreateReview):
-    data = payload.model_dump()
+@reviews_router.post("")
+async def create_review(payload: CreateReview):
+    data = as_document(payload)
     data.setdefault("status", "open")
-    try:
-        _id = create_document("review", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    _id = await create_document("review", data)
+    return {"id": _id}
 
-@app.get("/api/reviews")
-def list_reviews(designer_id: Optional[str] = None, cycle: Optional[str] = None):
+@reviews_router.get("")
+async def list_reviews(designer_id: Optional[str] = None, cycle: Optional[str] = None, fields: Optional[str] = None):
     query: Dict[str, Any] = {}
     if designer_id:
         query["designer_id"] = designer_id
     if cycle:
         query["cycle"] = cycle
-    try:
-        items = get_documents("review", query, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await get_documents_agg("review", query, 200, _projection(fields, PROJECTION_REVIEW))
+
+@reviews_router.get("/stream")
+async def stream_reviews(designer_id: Optional[str] = None, cycle: Optional[str] = None, fields: Optional[str] = None):
+    query: Dict[str, Any] = {}
+    if designer_id:
+        query["designer_id"] = designer_id
+    if cycle:
+        query["cycle"] = cycle
+    return ndjson_response(stream_documents_agg("review", query, 200, _projection(fields, PROJECTION_REVIEW)))
 
 # -------- Guilds & Mentorship --------
-class CreateGuild(BaseModel):
+guilds_router = APIRouter(tags=["guilds"], route_class=ServerErrorRoute)
+mentorships_router = APIRouter(tags=["mentorships"], route_class=ServerErrorRoute)
+PROJECTION_GUILD = schema_projection(schemas.Guild)
+PROJECTION_MENTORSHIP = schema_projection(schemas.Mentorship)
+
+class CreateGuild(CreateModel):
     name: str
     description: Optional[str] = None
 
-@app.post("/api/guilds")
-def create_guild(payload: CreateGuild):
-    try:
-        _id = create_document("guild", payload.model_dump())
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@guilds_router.post("")
+async def create_guild(payload: CreateGuild):
+    _id = await create_document("guild", as_document(payload))
+    invalidate_list_cache("guild")
+    return {"id": _id}
 
-@app.get("/api/guilds")
-def list_guilds():
-    try:
-        items = get_documents("guild", {}, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@guilds_router.get("")
+async def list_guilds(fields: Optional[str] = None):
+    return await cached_list("guild", {}, 200, _projection(fields, PROJECTION_GUILD))
 
-class CreateMentorship(BaseModel):
+class CreateMentorship(CreateModel):
     mentor_id: str
     mentee_id: str
     status: Optional[str] = "active"
 
-@app.post("/api/mentorships")
-def create_mentorship(payload: CreateMentorship):
-    data = payload.model_dump()
+@mentorships_router.post("")
+async def create_mentorship(payload: CreateMentorship):
+    data = as_document(payload)
     data.setdefault("activities", [])
-    try:
-        _id = create_document("mentorship", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    _id = await create_document("mentorship", data)
+    return {"id": _id}
 
-@app.get("/api/mentorships")
-def list_mentorships(mentor_id: Optional[str] = None, mentee_id: Optional[str] = None):
+@mentorships_router.get("")
+async def list_mentorships(mentor_id: Optional[str] = None, mentee_id: Optional[str] = None, fields: Optional[str] = None):
     query: Dict[str, Any] = {}
     if mentor_id:
         query["mentor_id"] = mentor_id
     if mentee_id:
         query["mentee_id"] = mentee_id
-    try:
-        items = get_documents("mentorship", query, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await get_documents_agg("mentorship", query, 200, _projection(fields, PROJECTION_MENTORSHIP))
 
 # -------- Training Resources --------
-class CreateResource(BaseModel):
+resources_router = APIRouter(tags=["resources"], route_class=ServerErrorRoute)
+PROJECTION_RESOURCE = schema_projection(schemas.TrainingResource)
+
+class CreateResource(CreateModel):
     title: str
     url: str
     provider: Optional[str] = None
     tags: Optional[List[str]] = None
 
-@app.post("/api/resources")
-def create_resource(payload: CreateResource):
-    data = payload.model_dump()
+@resources_router.post("")
+async def create_resource(payload: CreateResource):
+    data = as_document(payload)
     data.setdefault("tags", [])
-    try:
-        _id = create_document("trainingresource", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    _id = await create_document("trainingresource", data)
+    invalidate_list_cache("trainingresource")
+    return {"id": _id}
 
-@app.get("/api/resources")
-def list_resources(tag: Optional[str] = None):
+@resources_router.get("")
+async def list_resources(tag: Optional[str] = None, fields: Optional[str] = None):
     query: Dict[str, Any] = {}
     if tag:
         query["tags"] = {"$in": [tag]}
-    try:
-        items = get_documents("trainingresource", query, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await cached_list("trainingresource", query, 200, _projection(fields, PROJECTION_RESOURCE))
 
 # -------- Projects --------
-class CreateProject(BaseModel):
+projects_router = APIRouter(tags=["projects"], route_class=ServerErrorRoute)
+PROJECTION_PROJECT = schema_projection(schemas.Project)
+
+class CreateProject(CreateModel):
     name: str
     description: Optional[str] = None
     manager_id: Optional[str] = None
     designers: Optional[List[str]] = None
 
-@app.post("/api/projects")
-def create_project(payload: CreateProject):
-    data = payload.model_dump()
+@projects_router.post("")
+async def create_project(payload: CreateProject):
+    data = as_document(payload)
     data.setdefault("designers", [])
     data.setdefault("stages", [])
-    try:
-        _id = create_document("project", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    _id = await create_document("project", data)
+    return {"id": _id}
 
-@app.get("/api/projects")
-def list_projects(manager_id: Optional[str] = None, designer_id: Optional[str] = None):
+@projects_router.get("")
+async def list_projects(manager_id: Optional[str] = None, designer_id: Optional[str] = None, fields: Optional[str] = None):
     query: Dict[str, Any] = {}
     if manager_id:
         query["manager_id"] = manager_id
     if designer_id:
         query["designers"] = {"$in": [designer_id]}
-    try:
-        items = get_documents("project", query, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await get_documents_agg("project", query, 200, _projection(fields, PROJECTION_PROJECT))
 
 # -------- Notifications (log only) --------
-class CreateNotification(BaseModel):
+notifications_router = APIRouter(tags=["notifications"], route_class=ServerErrorRoute)
+PROJECTION_NOTIFICATION = schema_projection(schemas.Notification)
+
+class CreateNotification(CreateModel):
     user_id: str
     kind: str
     message: str
     sent_via: Optional[List[str]] = None
 
-@app.post("/api/notifications")
-def create_notification(payload: CreateNotification):
-    data = payload.model_dump()
+def _notification_document(payload: CreateNotification) -> Dict[str, Any]:
+    data = as_document(payload)
     data.setdefault("sent_via", [])
-    try:
-        _id = create_document("notification", data)
-        return {"id": _id}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return data
+
+@notifications_router.post("")
+async def create_notification(payload: CreateNotification):
+    data = _notification_document(payload)
+    _id = await create_document("notification", data)
+    return {"id": _id}
+
+@notifications_router.post("/bulk")
+async def create_notifications(payload: List[CreateNotification] = Body(..., max_length=MAX_BULK_ITEMS)):
+    return await bulk_insert("notification", [_notification_document(p) for p in payload])
 
-@app.get("/api/notifications")
-def list_notifications(user_id: Optional[str] = None):
+@notifications_router.get("")
+async def list_notifications(user_id: Optional[str] = None, fields: Optional[str] = None):
     query: Dict[str, Any] = {}
     if user_id:
         query["user_id"] = user_id
-    try:
-        items = get_documents("notification", query, 200)
-        for it in items:
-            it["_id"] = str(it.get("_id"))
-        return items
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return await get_documents_agg("notification", query, 200, _projection(fields, PROJECTION_NOTIFICATION))
 
 # -------- Dashboard summary --------
 @app.get("/api/summary")
-def summary(designer_id: Optional[str] = None):
-    out: Dict[str, Any] = {"competencies": COMPETENCIES, "career_levels": CAREER_LEVELS}
-    try:
-        if designer_id:
-            goals = get_documents("goal", {"designer_id": designer_id}, 100)
-            asses = get_documents("skillassessment", {"designer_id": designer_id}, 10)
-            reviews = get_documents("review", {"designer_id": designer_id}, 10)
-            for coll in (goals, asses, reviews):
-                for it in coll:
-                    it["_id"] = str(it.get("_id"))
-            out.update({"goals": goals, "assessments": asses, "reviews": reviews})
-        return out
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def summary(designer_id: Optional[str] = None):
+    if not designer_id:
+        return Response(REFERENCE_JSON, media_type="application/json")
+    out: Dict[str, Any] = dict(REFERENCE)
+    query: Dict[str, Any] = {"designer_id": designer_id}
+    # The three lookups are independent, so run them concurrently on the pool
+    goals, asses, reviews = await asyncio.gather(
+        get_documents_agg("goal", query, 100),
+        get_documents_agg("skillassessment", query, 10),
+        get_documents_agg("review", query, 10),
+    )
+    out.update({"goals": goals, "assessments": asses, "reviews": reviews})
+    return out
+
+# -------- Routing --------
+app.include_router(designers_router, prefix="/api/designers")
+app.include_router(goals_router, prefix="/api/goals")
+app.include_router(assessments_router, prefix="/api/assessments")
+app.include_router(reviews_router, prefix="/api/reviews")
+app.include_router(guilds_router, prefix="/api/guilds")
+app.include_router(mentorships_router, prefix="/api/mentorships")
+app.include_router(resources_router, prefix="/api/resources")
+app.include_router(projects_router, prefix="/api/projects")
+app.include_router(notifications_router, prefix="/api/notifications")
 
 if __name__ == "__main__":
-    import uvicorn
-    port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Hand over to Gunicorn rather than importing it here: its preload would
+    # otherwise import this module a second time as "main"
+    os.execvp("gunicorn", ["gunicorn", "-c", "gunicorn.conf.py", "main:app"])
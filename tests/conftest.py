@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+import main  # noqa: E402
+import mongomock_motor  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """TestClient against a fresh in-memory Mongo database"""
+    monkeypatch.setattr(database, "db", mongomock_motor.AsyncMongoMockClient()["test"])
+    monkeypatch.setattr(database, "COLLECTIONS", {})
+    monkeypatch.setattr(main, "db", database.db)
+    main._list_cache.clear()
+    with TestClient(main.app) as c:
+        yield c
@@ -0,0 +1,150 @@
+import asyncio
+
+import orjson
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+import database
+import main
+
+
+def test_list_default_projection_follows_schema(client):
+    asyncio.run(database.db.designer.insert_one(
+        {"name": "Ada", "email": "ada@example.com", "guilds": ["research"], "internal": "x"}
+    ))
+    client.post("/api/designers", json={"name": "Bo", "email": "bo@example.com"})
+    stored, created = client.get("/api/designers").json()
+    assert stored["guilds"] == ["research"]
+    assert "internal" not in stored
+    assert {"created_at", "updated_at"} <= set(created)
+
+
+def test_list_fields_param_limits_projection(client):
+    client.post("/api/designers", json={"name": "Ada", "email": "ada@example.com"})
+    (designer,) = client.get("/api/designers?fields=name").json()
+    assert set(designer) == {"_id", "name"}
+
+
+def test_list_fields_param_rejects_invalid_names(client):
+    for fields in ("$x", "a..b", "a.$b", "a,a.b"):
+        assert client.get(f"/api/goals?fields={fields}").status_code == 422
+        assert client.get(f"/api/goals/stream?fields={fields}").status_code == 422
+    assert client.get("/api/goals?fields=a.b,ab").status_code == 200
+
+
+def test_startup_creates_indexes(client):
+    indexes = asyncio.run(database.db.review.index_information())
+    assert "designer_id_1_cycle_1" in indexes
+
+
+def test_bulk_insert_reports_partial_failures(client):
+    asyncio.run(database.db.notification.create_index("message", unique=True))
+    items = [{"user_id": "u", "kind": "goal_due", "message": m} for m in ("a", "a", "b")]
+    r = client.post("/api/notifications/bulk", json=items)
+    assert r.status_code == 207
+    body = r.json()
+    assert len(body["ids"]) == 2
+    assert [e["index"] for e in body["errors"]] == [1]
+    assert len(client.get("/api/notifications").json()) == 2
+
+
+def test_bulk_insert_limits_batch_size(client):
+    item = {"designer_id": "d", "cycle": "2025-H1", "ratings": {"impact": 3}}
+    r = client.post("/api/assessments/bulk", json=[item] * 2)
+    assert r.status_code == 200 and len(r.json()["ids"]) == 2 and r.json()["errors"] == []
+    assert client.post("/api/assessments/bulk", json=[item] * 501).status_code == 422
+
+
+def test_goal_serialized_the_same_by_list_and_stream(client):
+    client.post("/api/goals", json={"designer_id": "d1", "title": "Ship", "target_date": "2025-06-30"})
+    (listed,) = client.get("/api/goals?designer_id=d1").json()
+    streamed = [orjson.loads(line) for line in client.get("/api/goals/stream?designer_id=d1").text.splitlines()]
+    assert streamed == [listed]
+    assert listed["target_date"] == "2025-06-30T00:00:00"
+
+
+def test_cached_lists_serialize_like_uncached_lists(client):
+    client.post("/api/guilds", json={"name": "Research"})
+    client.post("/api/designers", json={"name": "Ada", "email": "ada@example.com"})
+    (designer,) = client.get("/api/designers?fields=created_at").json()
+    for _ in range(2):  # miss, then hit
+        (guild,) = client.get("/api/guilds?fields=created_at").json()
+        assert "+" not in guild["created_at"] and len(guild["created_at"]) == len(designer["created_at"])
+
+
+def test_cors_headers(client):
+    assert "access-control-allow-origin" not in client.get("/").headers
+
+    simple = client.get("/", headers={"Origin": "https://a.example"}).headers
+    assert simple["access-control-allow-origin"] == "*"
+    assert simple["access-control-allow-credentials"] == "true"
+    assert "vary" not in simple
+
+    cookie = client.get("/", headers={"Origin": "https://a.example", "Cookie": "s=1"}).headers
+    assert cookie["access-control-allow-origin"] == "https://a.example"
+    assert cookie["access-control-allow-credentials"] == "true"
+    assert cookie["vary"] == "Origin"
+
+    r = client.options("/api/goals", headers={
+        "Origin": "https://a.example",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type",
+    })
+    assert r.status_code == 204
+    assert r.headers["access-control-allow-origin"] == "https://a.example"
+    assert r.headers["access-control-allow-headers"] == "content-type"
+    assert r.headers["vary"] == "Origin"
+
+
+def test_cors_merges_with_endpoint_headers():
+    app = FastAPI()
+    app.add_middleware(main.StaticCORSMiddleware)
+
+    @app.get("/")
+    def index():
+        return Response(headers={"Access-Control-Allow-Origin": "https://b.example", "Vary": "Accept-Encoding"})
+
+    @app.get("/origin")
+    def varies_on_origin():
+        return Response(headers={"Vary": "Origin"})
+
+    with TestClient(app) as c:
+        r = c.get("/", headers={"Origin": "https://a.example"})
+        assert r.headers.get_list("access-control-allow-origin") == ["*"]
+        assert r.headers.get_list("vary") == ["Accept-Encoding"]
+        r = c.get("/", headers={"Origin": "https://a.example", "Cookie": "s=1"})
+        assert r.headers.get_list("access-control-allow-origin") == ["https://a.example"]
+        assert r.headers.get_list("vary") == ["Accept-Encoding, Origin"]
+        r = c.get("/origin", headers={"Origin": "https://a.example", "Cookie": "s=1"})
+        assert r.headers.get_list("vary") == ["Origin"]
+
+
+def test_assessment_ratings_keep_known_keys_clamped(client):
+    item = {"designer_id": "d", "cycle": "2025-H1", "ratings": {"impact": 9, "bogus": 2}}
+    assert client.post("/api/assessments", json=item).status_code == 200
+    assert client.post("/api/assessments/bulk", json=[item]).status_code == 200
+    stored = client.get("/api/assessments?designer_id=d&fields=ratings").json()
+    assert [a["ratings"] for a in stored] == [{"impact": 4}, {"impact": 4}]
+
+
+def test_unexpected_errors_become_logged_500s_with_cors(client, monkeypatch, caplog):
+    async def fail(*args, **kwargs):
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(main, "get_documents_agg", fail)
+    r = client.get("/api/goals", headers={"Origin": "https://a.example"})
+    assert r.status_code == 500
+    assert r.json() == {"detail": "database down"}
+    assert r.headers["access-control-allow-origin"] == "*"
+    assert "Unhandled error in GET /api/goals" in caplog.text
+
+
+def test_starlette_http_exceptions_pass_through(client, monkeypatch):
+    async def gone(*args, **kwargs):
+        raise StarletteHTTPException(status_code=404, detail="gone")
+
+    monkeypatch.setattr(main, "get_documents_agg", gone)
+    r = client.get("/api/goals")
+    assert r.status_code == 404
+    assert r.json() == {"detail": "gone"}